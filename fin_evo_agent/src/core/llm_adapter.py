@@ -8,10 +8,10 @@ Features:
 
 import re
 from typing import Optional
-from openai import OpenAI
 
 import sys
-sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+if (_repo_root := str(__file__).rsplit("/", 3)[0]) not in sys.path:
+    sys.path.insert(0, _repo_root)
 from src.config import LLM_API_KEY, LLM_BASE_URL, LLM_MODEL, LLM_TEMPERATURE, LLM_ENABLE_THINKING
 
 
@@ -277,6 +277,9 @@ class LLMAdapter:
         self.enable_thinking = enable_thinking
 
         if LLM_API_KEY:
+            # Imported here: the openai package (httpx/pydantic chain)
+            # costs hundreds of ms and mock-mode runs never need it
+            from openai import OpenAI
             self.client = OpenAI(
                 api_key=LLM_API_KEY,
                 base_url=LLM_BASE_URL,
@@ -15,7 +15,8 @@ from sqlmodel import SQLModel, Field, Column, create_engine
 from sqlalchemy import JSON, Text
 
 import sys
-sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+if (_repo_root := str(__file__).rsplit("/", 3)[0]) not in sys.path:
+    sys.path.insert(0, _repo_root)
 from src.config import DB_URL
 
 
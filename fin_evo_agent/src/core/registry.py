@@ -11,7 +11,8 @@ from typing import Optional, List
 from sqlmodel import Session, create_engine, select
 
 import sys
-sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+if (_repo_root := str(__file__).rsplit("/", 3)[0]) not in sys.path:
+    sys.path.insert(0, _repo_root)
 from src.config import DB_URL, GENERATED_DIR, BOOTSTRAP_DIR
 from src.core.models import ToolArtifact, ToolStatus, Permission, SQLModel
 
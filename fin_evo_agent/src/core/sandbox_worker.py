@@ -0,0 +1,134 @@
+"""Persistent sandbox worker for tool execution.
+
+Launched by ToolExecutor as `python -u -m src.core.sandbox_worker` and
+kept alive across executions, so the interpreter (and the pandas/numpy
+imports that dominate cold start) are paid once per worker instead of
+once per tool call.
+
+Protocol: newline-delimited JSON frames on stdin/stdout.
+  request:  {"code": str, "func_name": str, "args": dict}
+  response: {"exit_code": int, "stdout": str, "stderr": str}
+
+Each frame is executed in a fresh namespace with __name__ == "__main__"
+(so tool self-test blocks run, matching the old runner-script behavior).
+The parent enforces the timeout and kills/replaces the worker, which
+keeps the process boundary as the containment unit.
+"""
+
+import base64
+import inspect
+import io
+import json
+import marshal
+import sys
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+
+
+def run_frame(frame: dict) -> dict:
+    """Execute one tool frame and capture its output."""
+    if "code_marshal" in frame:
+        # Pre-compiled by the parent (same interpreter version) - skip
+        # parsing and compiling here
+        code = marshal.loads(base64.b64decode(frame["code_marshal"]))
+    else:
+        code = frame["code"]
+    func_name = frame["func_name"]
+    args = frame.get("args") or {}
+
+    buf_out = io.StringIO()
+    buf_err = io.StringIO()
+    namespace = {"__name__": "__main__"}
+
+    try:
+        with redirect_stdout(buf_out), redirect_stderr(buf_err):
+            if isinstance(code, str):
+                code = compile(code, "<tool>", "exec")
+            exec(code, namespace)
+
+            if func_name == "verify_only":
+                # Self-tests in the if __name__ == '__main__' block already
+                # ran during the exec above
+                print("<<VERIFY_PASS>>")
+            else:
+                # Find the target function
+                target_func = namespace.get(func_name)
+                if not callable(target_func):
+                    # Fallback: first user-defined function in module scope
+                    target_func = None
+                    for name, obj in namespace.items():
+                        if callable(obj) and not name.startswith("_") and hasattr(obj, "__module__"):
+                            target_func = obj
+                            break
+
+                if target_func is None:
+                    print(f"Error: Function {func_name} not found.")
+                    return {
+                        "exit_code": 1,
+                        "stdout": buf_out.getvalue(),
+                        "stderr": buf_err.getvalue(),
+                    }
+
+                # Filter args to match function signature
+                sig = inspect.signature(target_func)
+                valid_params = set(sig.parameters.keys())
+                filtered_args = {k: v for k, v in args.items() if k in valid_params}
+
+                result = target_func(**filtered_args)
+                print("<<RESULT_START>>")
+                print(result)
+                print("<<RESULT_END>>")
+
+        return {
+            "exit_code": 0,
+            "stdout": buf_out.getvalue(),
+            "stderr": buf_err.getvalue(),
+        }
+    except Exception:
+        traceback.print_exc(file=buf_err)
+        return {
+            "exit_code": 1,
+            "stdout": buf_out.getvalue(),
+            "stderr": buf_err.getvalue(),
+        }
+
+
+def _apply_rlimits():
+    """Cap this worker's address space via the kernel.
+
+    Runaway allocations in tool code then fail with a plain MemoryError
+    instead of pressuring the host; enforcement is free after setrlimit.
+    Skipped on platforms without the resource module (Windows).
+    """
+    try:
+        import resource
+        from src.config import EXECUTION_MEMORY_MB
+        limit = EXECUTION_MEMORY_MB * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def main():
+    _apply_rlimits()
+
+    # Warm the heavy imports once per worker; tool code importing them
+    # afterwards hits sys.modules
+    import pandas  # noqa: F401
+    import numpy  # noqa: F401
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            frame = json.loads(line)
+            response = run_frame(frame)
+        except Exception as e:
+            response = {"exit_code": 1, "stdout": "", "stderr": f"Worker error: {e}"}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,8 @@ from typing import Dict, Any, Optional, Tuple, List
 from pathlib import Path
 
 import sys
-sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+if (_repo_root := str(__file__).rsplit("/", 3)[0]) not in sys.path:
+    sys.path.insert(0, _repo_root)
 
 from src.core.registry import ToolRegistry
 from src.core.executor import ToolExecutor
@@ -56,6 +57,24 @@ FINANCIAL_FETCH_PATTERNS = [
     r'财务报表',           # Chinese: "financial statement"
 ]
 
+# Compiled once at import as one alternation per group, so each query is
+# scanned in a single regex pass per group instead of once per pattern
+_SIMPLE_FETCH_RES = {
+    pattern_type: re.compile('|'.join(patterns), re.IGNORECASE)
+    for pattern_type, patterns in SIMPLE_FETCH_PATTERNS.items()
+}
+_FINANCIAL_FETCH_RE = re.compile('|'.join(FINANCIAL_FETCH_PATTERNS), re.IGNORECASE)
+
+# Query-parsing patterns, compiled once at import instead of per call
+_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+_TICKER_RE = re.compile(r'\b([A-Z]{2,5})\b')
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+_QUARTER_RE = re.compile(r'Q(\d)|(\d)(?:st|nd|rd|th)?\s*quarter', re.IGNORECASE)
+_RSI_PERIOD_RE = re.compile(r'RSI[- ]?(\d+)', re.IGNORECASE)
+_MACD_PARAMS_RE = re.compile(r'MACD\s*\(?\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)', re.IGNORECASE)
+_WINDOW_RE = re.compile(r'(\d+)[-\s]*day')
+_PERIOD_RE = re.compile(r'(\d+)[-\s]*(天|日|day|period)')
+
 
 class TaskExecutor:
     """Orchestrates task execution by chaining bootstrap fetch with calc tools."""
@@ -144,7 +163,7 @@ class TaskExecutor:
         # Step 3: Regex pattern matching with exclusion filter
         # Find all potential ticker patterns (2-5 uppercase letters)
         # Sort by length descending to prefer longer matches (GETH > GET)
-        matches = re.findall(r'\b([A-Z]{2,5})\b', query_upper)
+        matches = _TICKER_RE.findall(query_upper)
         matches_sorted = sorted(matches, key=len, reverse=True)
 
         for match in matches_sorted:
@@ -216,8 +235,7 @@ class TaskExecutor:
     def extract_date_range(self, query: str) -> Tuple[str, str]:
         """Extract date range from query, or return default."""
         # Try to find date patterns
-        date_pattern = r'(\d{4}-\d{2}-\d{2})'
-        dates = re.findall(date_pattern, query)
+        dates = _DATE_RE.findall(query)
 
         if len(dates) >= 2:
             return dates[0], dates[1]
@@ -390,23 +408,23 @@ class TaskExecutor:
         params = {}
 
         # Extract year from query (e.g., "2023", "2024")
-        year_match = re.search(r'\b(20\d{2})\b', query)
+        year_match = _YEAR_RE.search(query)
         if year_match:
             params['year'] = int(year_match.group(1))
 
         # Extract quarter from query (e.g., "Q1", "Q2", "1st quarter")
-        quarter_match = re.search(r'Q(\d)|(\d)(?:st|nd|rd|th)?\s*quarter', query, re.IGNORECASE)
+        quarter_match = _QUARTER_RE.search(query)
         if quarter_match:
             params['quarter'] = int(quarter_match.group(1) or quarter_match.group(2))
 
         # RSI period
-        if match := re.search(r'RSI[- ]?(\d+)', query, re.I):
+        if match := _RSI_PERIOD_RE.search(query):
             params['period'] = int(match.group(1))
         elif 'rsi' in query.lower():
             params['period'] = 14  # default RSI period
 
         # MACD parameters
-        if match := re.search(r'MACD\s*\(?\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)', query, re.I):
+        if match := _MACD_PARAMS_RE.search(query):
             params['fast_period'] = int(match.group(1))
             params['slow_period'] = int(match.group(2))
             params['signal_period'] = int(match.group(3))
@@ -422,7 +440,7 @@ class TaskExecutor:
 
         # Bollinger bands - only extract window if query mentions bollinger
         if 'bollinger' in query.lower() or '布林' in query:
-            if match := re.search(r'(\d+)[-\s]*day', query.lower()):
+            if match := _WINDOW_RE.search(query.lower()):
                 params['window'] = int(match.group(1))
             else:
                 params['window'] = 20
@@ -430,7 +448,7 @@ class TaskExecutor:
 
         # Generic period/window (for divergence, volatility, and other tasks)
         if 'period' not in params and 'window' not in params:
-            if match := re.search(r'(\d+)[-\s]*(天|日|day|period)', query.lower()):
+            if match := _PERIOD_RE.search(query.lower()):
                 params['period'] = int(match.group(1))
 
         return params
@@ -454,9 +472,8 @@ class TaskExecutor:
 
         # Financial queries now fall through to tool execution
         # (Previously raised ValueError, but fetch tools can now handle them)
-        for pattern in FINANCIAL_FETCH_PATTERNS:
-            if re.search(pattern, query_lower, re.IGNORECASE):
-                return None  # Fall through to tool execution
+        if _FINANCIAL_FETCH_RE.search(query_lower):
+            return None  # Fall through to tool execution
 
         # Get close prices from data
         close_prices = data.get('close', [])
@@ -464,15 +481,14 @@ class TaskExecutor:
             return None
 
         # Check simple fetch patterns (order: highest, lowest, latest)
-        for pattern_type, patterns in SIMPLE_FETCH_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, query_lower, re.IGNORECASE):
-                    if pattern_type == 'highest_close':
-                        return max(close_prices)
-                    elif pattern_type == 'lowest_close':
-                        return min(close_prices)
-                    elif pattern_type == 'latest_close':
-                        return close_prices[-1]
+        for pattern_type, pattern_re in _SIMPLE_FETCH_RES.items():
+            if pattern_re.search(query_lower):
+                if pattern_type == 'highest_close':
+                    return max(close_prices)
+                elif pattern_type == 'lowest_close':
+                    return min(close_prices)
+                elif pattern_type == 'latest_close':
+                    return close_prices[-1]
 
         # No match - fall through to tool execution
         return None
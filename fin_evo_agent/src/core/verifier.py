@@ -9,6 +9,7 @@ Verification stages:
 Tools are only promoted if ALL stages pass.
 """
 
+import hashlib
 import re
 import json
 import math
@@ -17,7 +18,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 
 import sys
-sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+if (_repo_root := str(__file__).rsplit("/", 3)[0]) not in sys.path:
+    sys.path.insert(0, _repo_root)
 
 from src.core.executor import ToolExecutor
 from src.core.registry import ToolRegistry
@@ -31,6 +33,19 @@ from src.core.contracts import (
 )
 
 
+# Deterministic sample data for contract tests, built once at import
+# instead of per _generate_test_args call
+_SAMPLE_PRICES = [100.0, 101.5, 99.8, 102.3, 101.0, 103.5, 102.8, 104.0, 103.2, 105.0,
+                  104.5, 106.0, 105.2, 107.0, 106.5, 108.0, 107.2, 109.0, 108.5, 110.0]
+_SAMPLE_HIGH = [101.0, 102.5, 100.8, 103.3, 102.0, 104.5, 103.8, 105.0, 104.2, 106.0,
+                105.5, 107.0, 106.2, 108.0, 107.5, 109.0, 108.2, 110.0, 109.5, 111.0]
+_SAMPLE_LOW = [99.0, 100.5, 98.8, 101.3, 100.0, 102.5, 101.8, 103.0, 102.2, 104.0,
+               103.5, 105.0, 104.2, 106.0, 105.5, 107.0, 106.2, 108.0, 107.5, 109.0]
+_SAMPLE_VOLUMES = [1000000, 1100000, 950000, 1200000, 1050000, 1150000, 1000000, 1250000,
+                   1100000, 1300000, 1050000, 1200000, 980000, 1150000, 1020000, 1180000,
+                   1050000, 1220000, 1000000, 1280000]
+
+
 class VerificationResult(str, Enum):
     """Result of a verification stage."""
     PASS = "pass"
@@ -38,7 +53,7 @@ class VerificationResult(str, Enum):
     SKIP = "skip"  # Stage not applicable
 
 
-@dataclass
+@dataclass(slots=True)
 class StageResult:
     """Result of a single verification stage."""
     stage: VerificationStage
@@ -47,7 +62,7 @@ class StageResult:
     details: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationReport:
     """Complete verification report for a tool."""
     tool_name: str
@@ -94,6 +109,11 @@ class MultiStageVerifier:
     ):
         self.executor = executor or ToolExecutor()
         self.registry = registry or ToolRegistry()
+        # Memoized reports keyed on (code hash, category, contract):
+        # refine retries and eval reruns verify identical sources
+        self._verify_cache: Dict[tuple, Tuple[bool, VerificationReport]] = {}
+        # Memoized contract test args (deterministic per contract)
+        self._test_args_cache: Dict[str, Dict[str, Any]] = {}
 
     def verify_all_stages(
         self,
@@ -106,6 +126,11 @@ class MultiStageVerifier:
         """
         Run all verification stages on the code.
 
+        Verification is deterministic for a given (code, category,
+        contract), so results are memoized by source hash; only runs
+        with real_data (network-dependent integration tests) bypass
+        the cache.
+
         Args:
             code: Python source code to verify
             category: Tool category ('fetch', 'calculation', 'composite')
@@ -116,6 +141,32 @@ class MultiStageVerifier:
         Returns:
             (passed, report) - passed is True only if all applicable stages pass
         """
+        cache_key = None
+        if real_data is None:
+            cache_key = (
+                hashlib.sha256(code.encode()).hexdigest(),
+                category,
+                contract.contract_id if contract else None,
+            )
+            cached = self._verify_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self._run_all_stages(code, category, task_id, contract, real_data)
+
+        if cache_key is not None:
+            self._verify_cache[cache_key] = result
+        return result
+
+    def _run_all_stages(
+        self,
+        code: str,
+        category: str,
+        task_id: str,
+        contract: ToolContract = None,
+        real_data: Dict[str, Any] = None
+    ) -> Tuple[bool, VerificationReport]:
+        """Run the full pipeline (uncached)."""
         # Extract function name for report
         func_name = self._extract_function_name(code) or "unknown"
         report = VerificationReport(tool_name=func_name, category=category)
@@ -350,32 +401,30 @@ class MultiStageVerifier:
         )
 
     def _generate_test_args(self, contract: ToolContract) -> Dict[str, Any]:
-        """Generate test arguments based on contract input types."""
-        args = {}
+        """Generate test arguments based on contract input types.
+
+        Generation is deterministic per contract, so results are
+        memoized by contract_id (a shallow copy is returned so callers
+        can add/override keys without poisoning the cache).
+        """
+        cached = self._test_args_cache.get(contract.contract_id)
+        if cached is not None:
+            return dict(cached)
 
-        # Sample data for common input types
-        sample_prices = [100.0, 101.5, 99.8, 102.3, 101.0, 103.5, 102.8, 104.0, 103.2, 105.0,
-                        104.5, 106.0, 105.2, 107.0, 106.5, 108.0, 107.2, 109.0, 108.5, 110.0]
-        sample_high = [101.0, 102.5, 100.8, 103.3, 102.0, 104.5, 103.8, 105.0, 104.2, 106.0,
-                      105.5, 107.0, 106.2, 108.0, 107.5, 109.0, 108.2, 110.0, 109.5, 111.0]
-        sample_low = [99.0, 100.5, 98.8, 101.3, 100.0, 102.5, 101.8, 103.0, 102.2, 104.0,
-                     103.5, 105.0, 104.2, 106.0, 105.5, 107.0, 106.2, 108.0, 107.5, 109.0]
-        sample_volumes = [1000000, 1100000, 950000, 1200000, 1050000, 1150000, 1000000, 1250000,
-                         1100000, 1300000, 1050000, 1200000, 980000, 1150000, 1020000, 1180000,
-                         1050000, 1220000, 1000000, 1280000]
+        args = {}
 
         for input_name, input_type in contract.input_types.items():
             if input_name in ('prices', 'close'):
-                args[input_name] = sample_prices
+                args[input_name] = _SAMPLE_PRICES
             elif input_name == 'high':
-                args[input_name] = sample_high
+                args[input_name] = _SAMPLE_HIGH
             elif input_name == 'low':
-                args[input_name] = sample_low
+                args[input_name] = _SAMPLE_LOW
             elif input_name in ('volume', 'volumes'):
-                args[input_name] = sample_volumes
+                args[input_name] = _SAMPLE_VOLUMES
             elif input_name in ('prices1', 'prices2'):
                 # For correlation, use slightly different data
-                args[input_name] = sample_prices if input_name == 'prices1' else sample_high
+                args[input_name] = _SAMPLE_PRICES if input_name == 'prices1' else _SAMPLE_HIGH
             elif input_name == 'symbol':
                 args[input_name] = 'AAPL'
             elif input_name in ('start', 'start_date'):
@@ -411,11 +460,12 @@ class MultiStageVerifier:
             elif input_type == 'str':
                 args[input_name] = 'default'
             elif input_type == 'list':
-                args[input_name] = sample_prices
+                args[input_name] = _SAMPLE_PRICES
             elif input_type == 'bool':
                 args[input_name] = True
 
-        return args
+        self._test_args_cache[contract.contract_id] = args
+        return dict(args)
 
     def _validate_output(
         self,
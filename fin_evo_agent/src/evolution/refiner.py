@@ -17,7 +17,8 @@ from datetime import datetime
 from sqlmodel import Session
 
 import sys
-sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+if (_repo_root := str(__file__).rsplit("/", 3)[0]) not in sys.path:
+    sys.path.insert(0, _repo_root)
 from src.core.llm_adapter import LLMAdapter
 from src.core.executor import ToolExecutor
 from src.core.registry import ToolRegistry
@@ -60,6 +61,10 @@ lower = middle - (num_std * std)
 ```
 """
 
+# Matches CPython error-class names (TypeError, KeyError, ...) so stderr
+# is scanned once instead of once per entry in ERROR_PATTERNS
+_ERROR_NAME_RE = re.compile(r"\b([A-Za-z]\w*Error)\b")
+
 # Errors that should not be retried (fail fast)
 UNFIXABLE_ERRORS = {
     "SecurityException",      # AST blocked code
@@ -71,6 +76,10 @@ UNFIXABLE_ERRORS = {
     "LLM API Error",          # LLM service failures
 }
 
+# One alternation over the banned tokens: stderr is screened in a single
+# pass instead of one substring scan per token
+_UNFIXABLE_RE = re.compile("|".join(re.escape(t) for t in sorted(UNFIXABLE_ERRORS)))
+
 
 class Refiner:
     """Tool refiner: Error Analysis → Patch → Register"""
@@ -127,10 +136,15 @@ class Refiner:
         self.engine = get_engine()
 
     def _classify_error(self, stderr: str) -> Tuple[str, str]:
-        """Classify error type and extract key information."""
+        """Classify error type and extract key information.
+
+        Collects the error-class names present in one linear scan, then
+        dispatches through ERROR_PATTERNS in declaration order (so e.g.
+        TypeError still wins over KeyError in a chained traceback).
+        """
+        found = set(_ERROR_NAME_RE.findall(stderr))
         for error_type, info in self.ERROR_PATTERNS.items():
-            match = re.search(info["pattern"], stderr)
-            if match:
+            if error_type in found:
                 return error_type, info["strategy"]
         return "UnknownError", "Analyze the error message and fix accordingly"
 
@@ -298,10 +312,10 @@ class Refiner:
         for attempt in range(max_attempts):
             # Check for unfixable errors first (fail-fast)
             stderr = current_trace.std_err or ""
-            for unfixable in UNFIXABLE_ERRORS:
-                if unfixable in stderr:
-                    print(f"[Refiner] Unfixable error detected: {unfixable} - aborting")
-                    return None, error_reports
+            unfixable = _UNFIXABLE_RE.search(stderr)
+            if unfixable:
+                print(f"[Refiner] Unfixable error detected: {unfixable.group(0)} - aborting")
+                return None, error_reports
 
             # Exponential backoff: 1s, 2s, 4s (skip on first attempt)
             if attempt > 0:
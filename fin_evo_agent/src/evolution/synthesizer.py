@@ -13,7 +13,8 @@ import re
 from typing import Tuple, Optional, List
 
 import sys
-sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+if (_repo_root := str(__file__).rsplit("/", 3)[0]) not in sys.path:
+    sys.path.insert(0, _repo_root)
 from src.core.llm_adapter import LLMAdapter
 from src.core.executor import ToolExecutor
 from src.core.registry import ToolRegistry
@@ -1,11 +1,12 @@
 """Bootstrap Tools Registration
 
-Registers 5 initial yfinance tools as ToolArtifacts:
+Registers 6 initial yfinance tools as ToolArtifacts:
 1. get_stock_hist - Stock historical OHLCV data
-2. get_financial_info - Financial summary (income statement)
-3. get_realtime_quote - Real-time market quotes
-4. get_index_daily - Index daily data
-5. get_etf_hist - ETF historical data
+2. get_stocks_hist - Batched multi-symbol historical data
+3. get_financial_info - Financial summary (income statement)
+4. get_realtime_quote - Real-time market quotes
+5. get_index_daily - Index daily data
+6. get_etf_hist - ETF historical data
 
 Each tool is registered with:
 - Standalone code that uses DataProvider.reproducible for caching
@@ -13,12 +14,19 @@ Each tool is registered with:
 - Built-in test cases in if __name__ == '__main__' block
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import sys
-sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+if (_repo_root := str(__file__).rsplit("/", 3)[0]) not in sys.path:
+    sys.path.insert(0, _repo_root)
 from src.core.registry import ToolRegistry
 from src.core.models import Permission, init_db
 
 
+log = logging.getLogger(__name__)
+
+
 # --- Bootstrap Tool Code Templates ---
 
 GET_STOCK_HIST_CODE = '''"""Get stock daily historical data with caching."""
@@ -51,9 +59,8 @@ def get_stock_hist(symbol: str, start: str, end: str) -> pd.DataFrame:
     if cache_path.exists():
         return pd.read_parquet(cache_path)
 
-    df = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False)
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+    df = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False,
+                     multi_level_index=False, threads=False)
     df = df.reset_index()
     if isinstance(df, pd.DataFrame) and not df.empty:
         df.astype(str).to_parquet(cache_path)
@@ -72,6 +79,59 @@ if __name__ == "__main__":
     print("All tests passed!")
 '''
 
+GET_STOCKS_HIST_CODE = '''"""Get historical data for multiple stocks in one batched download."""
+import pandas as pd
+import yfinance as yf
+import hashlib
+import json
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+def _get_cache_path(func_name: str, args: tuple, kwargs: dict) -> Path:
+    key = json.dumps({"f": func_name, "a": [str(a) for a in args], "k": kwargs}, sort_keys=True)
+    return CACHE_DIR / f"{hashlib.md5(key.encode()).hexdigest()}.parquet"
+
+def get_stocks_hist(symbols: list, start: str, end: str) -> pd.DataFrame:
+    """
+    Get daily historical data for multiple stocks in one batched download.
+
+    Args:
+        symbols: List of ticker symbols, e.g., ['AAPL', 'MSFT']
+        start: Start date, e.g., '2023-01-01'
+        end: End date, e.g., '2023-01-31'
+
+    Returns:
+        DataFrame with columns flattened to '{symbol}_{field}', plus Date
+    """
+    cache_path = _get_cache_path("get_stocks_hist", (symbols, start, end), {})
+    if cache_path.exists():
+        return pd.read_parquet(cache_path)
+
+    df = yf.download(list(symbols), start=start, end=end, auto_adjust=True,
+                     progress=False, group_by="ticker", threads=True)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = ['_'.join(str(level) for level in col if level) for col in df.columns]
+    df = df.reset_index()
+    if isinstance(df, pd.DataFrame) and not df.empty:
+        df.astype(str).to_parquet(cache_path)
+    return df
+
+if __name__ == "__main__":
+    # Test case 1: Batched fetch for two symbols
+    df = get_stocks_hist(["AAPL", "MSFT"], "2023-01-01", "2023-01-10")
+    assert len(df) > 0, "Should return non-empty DataFrame"
+    assert any("AAPL" in c for c in df.columns), "Should have AAPL columns"
+    assert any("MSFT" in c for c in df.columns), "Should have MSFT columns"
+
+    # Test case 2: Cache hit
+    df2 = get_stocks_hist(["AAPL", "MSFT"], "2023-01-01", "2023-01-10")
+    assert len(df) == len(df2), "Cache should return same data"
+
+    print("All tests passed!")
+'''
+
 GET_FINANCIAL_INFO_CODE = '''"""Get financial summary for a stock with caching."""
 import pandas as pd
 import yfinance as yf
@@ -155,11 +215,15 @@ def get_realtime_quote(symbol: str = None) -> pd.DataFrame:
         for sym in symbol_list:
             ticker = yf.Ticker(sym)
             info = ticker.fast_info
+            # last_price first: memoizes the price history that
+            # last_volume also reads, so yfinance fetches once per ticker
+            vals = {k: getattr(info, k, None)
+                    for k in ("last_price", "market_cap", "last_volume")}
             rows.append({
                 "symbol": sym,
-                "price": getattr(info, "last_price", None),
-                "market_cap": getattr(info, "market_cap", None),
-                "volume": getattr(info, "last_volume", None),
+                "price": vals["last_price"],
+                "market_cap": vals["market_cap"],
+                "volume": vals["last_volume"],
             })
         df = pd.DataFrame(rows)
         if not df.empty:
@@ -213,9 +277,8 @@ def get_index_daily(symbol: str, start: str, end: str) -> pd.DataFrame:
     if cache_path.exists():
         return pd.read_parquet(cache_path)
 
-    df = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False)
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+    df = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False,
+                     multi_level_index=False, threads=False)
     df = df.reset_index()
 
     if isinstance(df, pd.DataFrame) and not df.empty:
@@ -261,9 +324,8 @@ def get_etf_hist(symbol: str, start: str, end: str) -> pd.DataFrame:
     if cache_path.exists():
         return pd.read_parquet(cache_path)
 
-    df = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False)
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+    df = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False,
+                     multi_level_index=False, threads=False)
     df = df.reset_index()
 
     if isinstance(df, pd.DataFrame) and not df.empty:
@@ -292,6 +354,16 @@ BOOTSTRAP_TOOLS = [
         },
         "permissions": [Permission.NETWORK_READ.value, Permission.CALC_ONLY.value]
     },
+    {
+        "name": "get_stocks_hist",
+        "code": GET_STOCKS_HIST_CODE,
+        "args_schema": {
+            "symbols": "list",
+            "start": "str",
+            "end": "str"
+        },
+        "permissions": [Permission.NETWORK_READ.value, Permission.CALC_ONLY.value]
+    },
     {
         "name": "get_financial_info",
         "code": GET_FINANCIAL_INFO_CODE,
@@ -332,7 +404,12 @@ BOOTSTRAP_TOOLS = [
 
 
 def create_bootstrap_tools():
-    """Register all bootstrap tools to the database and disk."""
+    """Register all bootstrap tools to the database and disk.
+
+    Registration is I/O-bound (code file write + SQLite commit), so tools
+    are submitted concurrently through a small thread pool instead of
+    one-at-a-time. SQLite serializes the commits itself.
+    """
     print("=== Registering Bootstrap Tools ===\n")
 
     # Ensure DB exists
@@ -341,10 +418,8 @@ def create_bootstrap_tools():
     registry = ToolRegistry()
     registered = []
 
-    for tool_def in BOOTSTRAP_TOOLS:
-        print(f"Registering: {tool_def['name']}...")
-
-        tool = registry.register(
+    def _register(tool_def):
+        return registry.register(
             name=tool_def["name"],
             code=tool_def["code"],
             args_schema=tool_def["args_schema"],
@@ -352,12 +427,18 @@ def create_bootstrap_tools():
             is_bootstrap=True
         )
 
-        print(f"  > Version: {tool.semantic_version}")
-        print(f"  > File: {tool.file_path}")
-        print(f"  > Hash: {tool.content_hash[:8]}")
-        print()
+    with ThreadPoolExecutor(max_workers=len(BOOTSTRAP_TOOLS)) as pool:
+        futures = {pool.submit(_register, td): td for td in BOOTSTRAP_TOOLS}
+        for future in as_completed(futures):
+            tool_def = futures[future]
+            tool = future.result()
+
+            print(f"Registered: {tool_def['name']}")
+            log.info("  > Version: %s", tool.semantic_version)
+            log.info("  > File: %s", tool.file_path)
+            log.info("  > Hash: %s", tool.content_hash[:8])
 
-        registered.append(tool)
+            registered.append(tool)
 
     print(f"[Done] Registered {len(registered)} bootstrap tools.")
     return registered
@@ -8,28 +8,79 @@ Features:
 - Retry with exponential backoff for network resilience
 - Parquet caching for reproducibility
 
-Cache key: MD5(func_name + args + kwargs)
-Storage: data/cache/{key}.parquet
+Cache key: BLAKE2b(func_name + args + kwargs)
+Storage: data/cache/refs/{key}.parquet -> data/cache/content/{hash}.parquet
 """
 
 import hashlib
-import json
+import logging
+import os
+import random
 import time
+from datetime import datetime
 from functools import wraps
 from pathlib import Path
 from typing import Callable, TypeVar
 
-import yfinance as yf
+import numpy as np
 import pandas as pd
 
 import sys
-sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+if (_repo_root := str(__file__).rsplit("/", 3)[0]) not in sys.path:
+    sys.path.insert(0, _repo_root)
 from src.config import CACHE_DIR
 
 
+log = logging.getLogger(__name__)
+
+
+# Content-addressed cache layout:
+# - content/{sha256-of-frame}.parquet holds the actual bytes (one copy per
+#   distinct frame, deduplicated across functions returning identical data)
+# - refs/{md5-of-key}.parquet is a hardlink to the content file
+CACHE_CONTENT_DIR = CACHE_DIR / "content"
+CACHE_REFS_DIR = CACHE_DIR / "refs"
+for _p in (CACHE_CONTENT_DIR, CACHE_REFS_DIR):
+    _p.mkdir(parents=True, exist_ok=True)
+
+
+# yfinance (and the requests session backing it) is only needed on cache
+# misses, but costs hundreds of ms to import. Both are created lazily so
+# 100%-cache-hit runs never pay for them.
+_yf = None
+_session = None
+
+
+def _get_yf():
+    """Import yfinance on first network use."""
+    global _yf
+    if _yf is None:
+        import yfinance
+        _yf = yfinance
+    return _yf
+
+
+def _get_session():
+    """Build the pooled HTTP session shared by all yfinance calls.
+
+    Avoids a fresh TLS handshake per Ticker/download (retries stay with
+    with_retry; the adapter does none of its own).
+    """
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+        _session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+        )
+    return _session
+
+
 # Network retry configuration
 RETRY_MAX_ATTEMPTS = 3
-RETRY_BASE_DELAY = 1.0  # seconds
+RETRY_BASE_DELAY = 1.0  # seconds (floor for rate-limit errors only)
+RETRY_FAST_BASE_DELAY = 0.1  # seconds (transient errors: 5xx, timeouts)
 RETRY_MAX_DELAY = 10.0  # seconds
 RETRY_BACKOFF_FACTOR = 2.0
 
@@ -37,17 +88,60 @@ RETRY_BACKOFF_FACTOR = 2.0
 T = TypeVar('T')
 
 
+def _is_rate_limited(exc: Exception) -> bool:
+    """Check if an exception is an HTTP 429 rate-limit error.
+
+    Rate-limit errors keep the 1s backoff floor; other transient errors
+    (5xx, timeouts) retry much faster since they usually clear immediately.
+    """
+    if type(exc).__name__ == 'YFRateLimitError':
+        return True
+    return '429' in str(exc)
+
+
+def _wait(delay: float, cancel_event=None) -> bool:
+    """Wait for `delay` seconds on a monotonic clock.
+
+    Args:
+        delay: Seconds to wait
+        cancel_event: Optional threading.Event; if set during the wait,
+                      the wait is aborted early
+
+    Returns:
+        True if the wait completed, False if cancelled
+    """
+    if cancel_event is not None:
+        # Event.wait returns True when the event is set (cancelled)
+        return not cancel_event.wait(delay)
+
+    deadline = time.monotonic() + delay
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return True
+        time.sleep(remaining)
+
+
 def with_retry(
     max_attempts: int = RETRY_MAX_ATTEMPTS,
     base_delay: float = RETRY_BASE_DELAY,
     max_delay: float = RETRY_MAX_DELAY,
     backoff_factor: float = RETRY_BACKOFF_FACTOR
 ) -> Callable:
-    """Decorator for retry with exponential backoff.
+    """Decorator for retry with exponential backoff and jitter.
+
+    Delay classification per attempt:
+    - Rate-limit errors (HTTP 429 / YFRateLimitError): base_delay floor (1s)
+    - Other transient errors (5xx, timeouts): fast 0.1s base
+
+    Random jitter (50-100% of the computed delay) avoids thundering herd
+    when multiple fetches retry at once. The wait runs on a monotonic
+    clock and can be interrupted by passing `cancel_event` (a
+    threading.Event) as a keyword argument to the wrapped function.
 
     Args:
         max_attempts: Maximum number of retry attempts
-        base_delay: Initial delay between retries (seconds)
+        base_delay: Initial delay for rate-limit errors (seconds)
         max_delay: Maximum delay between retries (seconds)
         backoff_factor: Multiplier for exponential backoff
 
@@ -57,8 +151,8 @@ def with_retry(
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
+            cancel_event = kwargs.pop('cancel_event', None)
             last_exception = None
-            delay = base_delay
 
             for attempt in range(max_attempts):
                 try:
@@ -66,14 +160,22 @@ def with_retry(
                 except Exception as e:
                     last_exception = e
                     if attempt < max_attempts - 1:
-                        # Log retry attempt
-                        print(f"[Retry] Attempt {attempt + 1}/{max_attempts} failed: {e}")
-                        print(f"[Retry] Waiting {delay:.1f}s before retry...")
-                        time.sleep(delay)
-                        # Exponential backoff
-                        delay = min(delay * backoff_factor, max_delay)
+                        # Classify error to pick the backoff base
+                        if _is_rate_limited(e):
+                            delay = base_delay * backoff_factor ** attempt
+                        else:
+                            delay = RETRY_FAST_BASE_DELAY * 2 ** attempt
+                        delay = min(delay, max_delay)
+                        # Jitter: 50-100% of computed delay
+                        delay *= 0.5 + random.random() * 0.5
+
+                        log.debug("[Retry] Attempt %d/%d failed: %s", attempt + 1, max_attempts, e)
+                        log.debug("[Retry] Waiting %.2fs before retry...", delay)
+                        if not _wait(delay, cancel_event):
+                            log.debug("[Retry] Cancelled during backoff")
+                            break
                     else:
-                        print(f"[Retry] All {max_attempts} attempts failed")
+                        log.debug("[Retry] All %d attempts failed", max_attempts)
 
             raise last_exception
 
@@ -81,43 +183,116 @@ def with_retry(
     return decorator
 
 
+# Retry decorator is parameterized by constants - build it once at import
+# instead of re-applying @with_retry on every cache-miss call
+_RETRY_DECORATOR = with_retry(max_attempts=RETRY_MAX_ATTEMPTS)
+
+
 class DataProvider:
     """yfinance proxy implementing 'Record-Replay' mechanism for reproducibility."""
 
     @staticmethod
-    def _get_cache_path(func_name: str, args: tuple, kwargs: dict) -> Path:
-        """Generate unique cache path from function signature."""
-        key = json.dumps({
-            "f": func_name,
-            "a": [str(a) for a in args],
-            "k": {k: str(v) for k, v in sorted(kwargs.items())}
-        }, sort_keys=True)
-        hash_key = hashlib.md5(key.encode()).hexdigest()
-        return CACHE_DIR / f"{hash_key}.parquet"
+    def _read_cached(cache_path: Path) -> pd.DataFrame:
+        """Read a cached frame, minimizing arrow->pandas conversion cost.
+
+        Cached OHLCV frames are tiny (typically <100 rows), so conversion
+        dominates read time. Memory-mapping skips a buffer copy and
+        split_blocks/self_destruct skip the BlockManager consolidation
+        step that pd.read_parquet would otherwise do.
+        """
+        import pyarrow.parquet as pq
+        table = pq.read_table(cache_path, memory_map=True)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    @staticmethod
+    def _content_hash(df: pd.DataFrame) -> str:
+        """Compute content hash over frame values and column names."""
+        h = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+        h.update(str(list(df.columns)).encode())
+        return h.hexdigest()[:32]
+
+    @staticmethod
+    def _write_parquet(df: pd.DataFrame, path: Path):
+        """Write a small frame as a single zstd row group.
+
+        The pyarrow defaults (snappy, 64K-row groups, column statistics)
+        are sized for big analytical files; cached frames are a few
+        hundred rows at most. One row group per file minimizes footer
+        parsing on read, zstd level 1 compresses tabular data better
+        than snappy at similar speed, and statistics are skipped since
+        these files are never predicate-pushed.
+        """
+        df.to_parquet(
+            path,
+            engine="pyarrow",
+            compression="zstd",
+            compression_level=1,
+            row_group_size=max(len(df), 1),
+            write_statistics=False,
+        )
+
+    @classmethod
+    def _write_deduplicated(cls, df: pd.DataFrame, ref_path: Path, content_hash: str):
+        """Write frame to content store and hardlink the ref to it.
+
+        Identical frames fetched via different functions/signatures share
+        one parquet file on disk. Falls back to symlink, then a plain
+        copy, if the filesystem doesn't support hardlinks.
+        """
+        content_path = CACHE_CONTENT_DIR / f"{content_hash}.parquet"
+        if not content_path.exists():
+            cls._write_parquet(df, content_path)
+        try:
+            os.link(content_path, ref_path)
+        except OSError:
+            try:
+                os.symlink(content_path, ref_path)
+            except OSError:
+                cls._write_parquet(df, ref_path)
 
     @classmethod
     def reproducible(cls, func):
         """Decorator for reproducible data access with Parquet caching and retry."""
+        # Wrap with retry once at decoration time - no per-call closure
+        # construction on the cache-miss path
+        fetch_with_retry = _RETRY_DECORATOR(func)
+
+        # Specialize the cache key for this function: the function name is
+        # burned into the closure as bytes, so per-call key derivation only
+        # hashes the varying args (no dict build, no json.dumps)
+        fname_bytes = func.__name__.encode()
+
+        def make_cache_path(args: tuple, kwargs: dict, ttl: str = None) -> Path:
+            parts = [
+                fname_bytes,
+                repr(args).encode(),
+                repr(sorted(kwargs.items())).encode(),
+            ]
+            if ttl is not None:
+                # Date bucket: entries expire when the bucket rolls over
+                parts.append(datetime.now().strftime(ttl).encode())
+            key = hashlib.blake2b(b"|".join(parts), digest_size=16).hexdigest()
+            return CACHE_REFS_DIR / f"{key}.parquet"
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            cache_path = cls._get_cache_path(func.__name__, args, kwargs)
+            cache_path = make_cache_path(args, kwargs, getattr(wrapper, "_ttl", None))
 
             # 1. Replay mode (cache hit)
             if cache_path.exists():
-                return pd.read_parquet(cache_path)
+                return cls._read_cached(cache_path)
 
             # 2. Record mode (cache miss) with retry
-            @with_retry(max_attempts=RETRY_MAX_ATTEMPTS)
-            def fetch_with_retry():
-                print(f"[Network] Fetching {func.__name__}...")
-                return func(*args, **kwargs)
-
             try:
-                df = fetch_with_retry()
+                log.debug("[Network] Fetching %s...", func.__name__)
+                df = fetch_with_retry(*args, **kwargs)
 
                 # Save to Parquet (convert all columns to str for compatibility)
                 if isinstance(df, pd.DataFrame) and not df.empty:
-                    df.astype(str).to_parquet(cache_path)
+                    str_df = df.astype(str)
+                    cls._write_deduplicated(
+                        str_df, cache_path, cls._content_hash(str_df)
+                    )
                 return df
             except Exception as e:
                 raise RuntimeError(f"Data Fetch Failed after {RETRY_MAX_ATTEMPTS} attempts: {str(e)}")
@@ -139,9 +314,37 @@ def get_stock_hist(symbol: str, start: str, end: str) -> pd.DataFrame:
     Returns:
         DataFrame with columns: Date, Open, High, Low, Close, Volume
     """
-    df = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False)
+    df = _get_yf().download(symbol, start=start, end=end, auto_adjust=True, progress=False,
+                     multi_level_index=False, threads=False, session=_get_session())
+    df = df.reset_index()
+    return df
+
+
+@DataProvider.reproducible
+def get_stocks_hist(symbols: list, start: str, end: str) -> pd.DataFrame:
+    """
+    Get daily historical data for multiple stocks in one batched download.
+
+    A single yf.download call amortizes auth/crumb setup across symbols
+    and uses yfinance's internal thread pool instead of one request per
+    ticker. The whole multi-symbol frame is cached under one key.
+
+    Args:
+        symbols: List of ticker symbols, e.g., ['AAPL', 'MSFT']
+        start: Start date, e.g., '2023-01-01'
+        end: End date, e.g., '2023-01-31'
+
+    Returns:
+        DataFrame with columns flattened to '{symbol}_{field}'
+        (e.g., 'AAPL_Close'), plus Date
+    """
+    df = _get_yf().download(
+        list(symbols), start=start, end=end, auto_adjust=True,
+        progress=False, group_by="ticker", threads=True, session=_get_session()
+    )
     if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+        # Flatten (symbol, field) columns so the frame is parquet-cacheable
+        df.columns = ['_'.join(str(level) for level in col if level) for col in df.columns]
     df = df.reset_index()
     return df
 
@@ -157,7 +360,7 @@ def get_financial_info(symbol: str) -> pd.DataFrame:
     Returns:
         DataFrame with key financial metrics (income statement)
     """
-    ticker = yf.Ticker(symbol)
+    ticker = _get_yf().Ticker(symbol, session=_get_session())
     df = ticker.income_stmt
     if isinstance(df, pd.DataFrame) and not df.empty:
         df = df.T  # Transpose: rows = periods, columns = metrics
@@ -178,17 +381,34 @@ def get_spot_price(symbols: str = "AAPL,MSFT,GOOGL") -> pd.DataFrame:
         DataFrame with current prices and trading data
     """
     symbol_list = [s.strip() for s in symbols.split(",")]
-    rows = []
-    for sym in symbol_list:
-        ticker = yf.Ticker(sym)
-        info = ticker.fast_info
-        rows.append({
-            "symbol": sym,
-            "price": getattr(info, "last_price", None),
-            "market_cap": getattr(info, "market_cap", None),
-            "volume": getattr(info, "last_volume", None),
-        })
-    return pd.DataFrame(rows)
+
+    # Build columns directly (SoA) - avoids per-row dict allocation and
+    # pandas' column inference over a list of dicts
+    n = len(symbol_list)
+    prices = np.full(n, np.nan)
+    caps = np.full(n, np.nan)
+    vols = np.full(n, np.nan)
+    yf = _get_yf()
+    session = _get_session()
+    for i, sym in enumerate(symbol_list):
+        info = yf.Ticker(sym, session=session).fast_info
+        # Read last_price first: it loads and memoizes the price history
+        # that last_volume reads from, so the backing data is fetched
+        # once per ticker instead of per attribute
+        vals = {k: getattr(info, k, None)
+                for k in ("last_price", "market_cap", "last_volume")}
+        if vals["last_price"] is not None:
+            prices[i] = vals["last_price"]
+        if vals["market_cap"] is not None:
+            caps[i] = vals["market_cap"]
+        if vals["last_volume"] is not None:
+            vols[i] = vals["last_volume"]
+    return pd.DataFrame({
+        "symbol": symbol_list,
+        "price": prices,
+        "market_cap": caps,
+        "volume": vols,
+    })
 
 
 @DataProvider.reproducible
@@ -204,9 +424,8 @@ def get_index_daily(symbol: str, start: str, end: str) -> pd.DataFrame:
     Returns:
         DataFrame with index OHLCV data
     """
-    df = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False)
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+    df = _get_yf().download(symbol, start=start, end=end, auto_adjust=True, progress=False,
+                     multi_level_index=False, threads=False, session=_get_session())
     df = df.reset_index()
     return df
 
@@ -224,13 +443,20 @@ def get_etf_hist(symbol: str, start: str, end: str) -> pd.DataFrame:
     Returns:
         DataFrame with ETF OHLCV data
     """
-    df = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False)
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+    df = _get_yf().download(symbol, start=start, end=end, auto_adjust=True, progress=False,
+                     multi_level_index=False, threads=False, session=_get_session())
     df = df.reset_index()
     return df
 
 
+# Coarse TTL via date-bucketed cache keys. Functions whose args already
+# bound the data in time (get_stock_hist etc.) cache forever; quote and
+# financial lookups would otherwise never expire, so their keys embed a
+# strftime bucket that rolls over on its own.
+get_financial_info._ttl = "%Y%m"    # income statements update quarterly
+get_spot_price._ttl = "%Y%m%d%H"    # quotes go stale within the hour
+
+
 if __name__ == "__main__":
     # Test bootstrap tools
     print("Testing bootstrap tools...")